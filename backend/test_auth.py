@@ -4,102 +4,110 @@ Test script for authentication middleware
 Creates a JWT token and tests protected endpoints
 """
 
-import jwt
-import requests
-import json
-from datetime import datetime, timedelta
-import uuid
+import os
 
-# JWT configuration (matches backend .env)
-JWT_SECRET = "your-super-secret-jwt-key-change-this-in-production-please"
-ALGORITHM = "HS256"
+from test_utils.fast_json import dumps_pretty, loads
+from test_utils.jwt_helper import make_token
+from test_utils.output import buffered_output
+from test_utils.parallel import run_checks
+from test_utils.lazy_session import LazySession
 
 # Backend URL
 BASE_URL = "http://localhost:3000"
 
-def create_test_token():
-    """Create a test JWT token"""
-    user_id = str(uuid.uuid4())
-    now = datetime.utcnow()
-    exp = now + timedelta(hours=24)
-    
-    payload = {
-        "sub": user_id,
-        "email": "test@example.com",
-        "username": "testuser",
-        "exp": int(exp.timestamp()),
-        "iat": int(now.timestamp())
-    }
-    
-    token = jwt.encode(payload, JWT_SECRET, algorithm=ALGORITHM)
-    return token, user_id
+SESSION = LazySession()
+INVALID_HEADERS = {"Authorization": "Bearer invalid-token-here"}
 
-def test_endpoints():
-    """Test various endpoints with and without authentication"""
-    
-    print("🧪 Testing Kilter Board Authentication Middleware")
-    print("=" * 50)
-    
-    # Test public endpoint
-    print("\n1. Testing public endpoint (no auth required)")
-    try:
-        response = requests.get(f"{BASE_URL}/")
-        print(f"   Status: {response.status_code}")
-        print(f"   Response: {response.text}")
-    except requests.exceptions.ConnectionError:
-        print("   ❌ Server not running. Start with: just dev")
-        return
-    
-    # Test health endpoint
-    print("\n2. Testing health endpoint (no auth required)")
-    response = requests.get(f"{BASE_URL}/health")
-    print(f"   Status: {response.status_code}")
-    if response.status_code == 200:
-        print(f"   Response: {response.json()}")
-    
-    # Test protected endpoint without token
-    print("\n3. Testing protected endpoint without token")
-    response = requests.get(f"{BASE_URL}/protected")
-    print(f"   Status: {response.status_code}")
+def format_json(data) -> str:
+    """Pretty-print JSON when PRETTY is set, otherwise use the cheap repr"""
+    if not os.environ.get("PRETTY"):
+        return str(data)
+    return dumps_pretty(data)
+
+def check_health(emit):
+    """Test health endpoint (no auth required)"""
+    emit("\n2. Testing health endpoint (no auth required)")
+    response = SESSION.get(f"{BASE_URL}/health")
+    emit(f"   Status: {response.status_code}")
+    if response.ok:
+        emit(f"   Response: {loads(response.content)}")
+
+def check_protected_without_token(emit):
+    """Test protected endpoint without token"""
+    emit("\n3. Testing protected endpoint without token")
+    response = SESSION.get(f"{BASE_URL}/protected")
+    emit(f"   Status: {response.status_code}")
     if response.status_code == 401:
-        print(f"   Response: {response.json()}")
-        print("   ✅ Correctly rejected unauthenticated request")
-    
-    # Create test token
-    print("\n4. Creating test JWT token")
-    token, user_id = create_test_token()
-    print(f"   User ID: {user_id}")
-    print(f"   Token: {token[:50]}...")
-    
-    # Test protected endpoint with token
-    print("\n5. Testing protected endpoint with valid token")
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"{BASE_URL}/protected", headers=headers)
-    print(f"   Status: {response.status_code}")
-    if response.status_code == 200:
-        print(f"   Response: {response.json()}")
-        print("   ✅ Successfully authenticated")
-    
-    # Test user info endpoint
-    print("\n6. Testing user info extraction endpoint")
-    response = requests.get(f"{BASE_URL}/user-info", headers=headers)
-    print(f"   Status: {response.status_code}")
-    if response.status_code == 200:
-        data = response.json()
-        print(f"   Response: {json.dumps(data, indent=2)}")
-        print("   ✅ Successfully extracted user info from JWT")
-    
-    # Test with invalid token
-    print("\n7. Testing with invalid token")
-    invalid_headers = {"Authorization": "Bearer invalid-token-here"}
-    response = requests.get(f"{BASE_URL}/protected", headers=invalid_headers)
-    print(f"   Status: {response.status_code}")
+        emit(f"   Response: {response.text}")
+        emit("   ✅ Correctly rejected unauthenticated request")
+
+def check_protected_with_token(emit, auth_headers: dict):
+    """Test protected endpoint with token"""
+    emit("\n5. Testing protected endpoint with valid token")
+    response = SESSION.get(f"{BASE_URL}/protected", headers=auth_headers)
+    emit(f"   Status: {response.status_code}")
+    if response.ok:
+        emit(f"   Response: {loads(response.content)}")
+        emit("   ✅ Successfully authenticated")
+
+def check_user_info(emit, auth_headers: dict):
+    """Test user info endpoint"""
+    emit("\n6. Testing user info extraction endpoint")
+    response = SESSION.get(f"{BASE_URL}/user-info", headers=auth_headers)
+    emit(f"   Status: {response.status_code}")
+    if response.ok:
+        data = loads(response.content)
+        emit(f"   Response: {format_json(data)}")
+        emit("   ✅ Successfully extracted user info from JWT")
+
+def check_invalid_token(emit):
+    """Test with invalid token"""
+    emit("\n7. Testing with invalid token")
+    response = SESSION.get(f"{BASE_URL}/protected", headers=INVALID_HEADERS)
+    emit(f"   Status: {response.status_code}")
     if response.status_code == 401:
-        print(f"   Response: {response.json()}")
-        print("   ✅ Correctly rejected invalid token")
+        emit(f"   Response: {response.text}")
+        emit("   ✅ Correctly rejected invalid token")
+
+def test_endpoints():
+    """Test various endpoints with and without authentication"""
+    import requests
     
-    print("\n" + "=" * 50)
-    print("🎉 Authentication middleware tests completed!")
+    with buffered_output() as emit:
+        emit("🧪 Testing Kilter Board Authentication Middleware")
+        emit("=" * 50)
+        
+        # Test public endpoint; this doubles as the server check, so run it first
+        emit("\n1. Testing public endpoint (no auth required)")
+        try:
+            response = SESSION.get(f"{BASE_URL}/")
+            emit(f"   Status: {response.status_code}")
+            emit(f"   Response: {response.text}")
+        except requests.exceptions.ConnectionError:
+            emit("   ❌ Server not running. Start with: just dev")
+            return
+        
+        # Create test token (no request involved)
+        token_lines = ["\n4. Creating test JWT token"]
+        token, user_id = make_token("test@example.com", "testuser")
+        token_lines.append(f"   User ID: {user_id}")
+        token_lines.append(f"   Token: {token[:50]}...")
+        auth_headers = {"Authorization": "Bearer " + token}
+        
+        # The remaining checks are independent, so overlap their round trips
+        health, without_token, with_token, user_info, invalid_token = run_checks([
+            (check_health,),
+            (check_protected_without_token,),
+            (check_protected_with_token, auth_headers),
+            (check_user_info, auth_headers),
+            (check_invalid_token,),
+        ])
+        for lines in (health, without_token, token_lines, with_token, user_info, invalid_token):
+            for line in lines:
+                emit(line)
+        
+        emit("\n" + "=" * 50)
+        emit("🎉 Authentication middleware tests completed!")
 
 if __name__ == "__main__":
     test_endpoints()
\ No newline at end of file
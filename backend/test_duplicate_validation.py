@@ -3,115 +3,105 @@
 Test script to verify duplicate email/username validation
 """
 
-import requests
-import json
+from test_utils.fast_json import JSON_HEADERS, dumps
+from test_utils.output import buffered_output
+from test_utils.lazy_session import LazySession
 
 BASE_URL = "http://localhost:3000"
 
+SESSION = LazySession()
+
+# Registration payload shared by the fast-fail cases; only email/username vary
+VALIDATION_PAYLOAD = {
+    "password": "securepassword",
+    "profile": {
+        "privacy_settings": {
+            "profile_visibility": "public",
+            "statistics_visibility": "public",
+            "history_visibility": "public"
+        }
+    }
+}
+
+# (label, email, username, expected error bytes in the response body)
+VALIDATION_CASES = [
+    ("Invalid email format", "invalid-email-format", "validuser", b"Invalid email format"),
+    ("Invalid username length", "valid@example.com", "ab", b"Username must be between 3 and 50 characters"),
+]
+
 def test_duplicate_validation():
     """Test that duplicate email and username are properly rejected"""
-    print("🧪 Testing duplicate validation...")
-    
-    # Use timestamp to make data unique
-    import time
-    timestamp = int(time.time())
-    
-    # First user data
-    user_data = {
-        "email": f"duplicate{timestamp}@example.com",
-        "username": f"duplicateuser{timestamp}",
-        "password": "securepassword",
-        "profile": {
-            "first_name": "First",
-            "last_name": "User",
-            "display_name": "FirstUser",
-            "privacy_settings": {
-                "profile_visibility": "public",
-                "statistics_visibility": "public",
-                "history_visibility": "public"
+    with buffered_output() as emit:
+        emit("🧪 Testing duplicate validation...")
+        
+        # Use timestamp to make data unique
+        import time
+        timestamp = int(time.time())
+        
+        # First user data
+        user_data = {
+            "email": f"duplicate{timestamp}@example.com",
+            "username": f"duplicateuser{timestamp}",
+            "password": "securepassword",
+            "profile": {
+                "first_name": "First",
+                "last_name": "User",
+                "display_name": "FirstUser",
+                "privacy_settings": {
+                    "profile_visibility": "public",
+                    "statistics_visibility": "public",
+                    "history_visibility": "public"
+                }
             }
         }
-    }
-    
-    # Register first user
-    response1 = requests.post(f"{BASE_URL}/users", json=user_data)
-    if response1.status_code == 200:
-        print("✅ First user registered successfully")
-    else:
-        print(f"❌ First registration failed: {response1.status_code} - {response1.text}")
-        return False
-    
-    # Try to register with same email
-    user_data2 = user_data.copy()
-    user_data2["username"] = "differentuser"
-    
-    response2 = requests.post(f"{BASE_URL}/users", json=user_data2)
-    if response2.status_code == 400 and "Email already registered" in response2.text:
-        print("✅ Duplicate email correctly rejected")
-    else:
-        print(f"❌ Duplicate email not rejected properly: {response2.status_code} - {response2.text}")
-        return False
-    
-    # Try to register with same username
-    user_data3 = user_data.copy()
-    user_data3["email"] = f"different{timestamp}@example.com"
-    
-    response3 = requests.post(f"{BASE_URL}/users", json=user_data3)
-    if response3.status_code == 400 and "Username already taken" in response3.text:
-        print("✅ Duplicate username correctly rejected")
-    else:
-        print(f"❌ Duplicate username not rejected properly: {response3.status_code} - {response3.text}")
-        return False
-    
-    return True
+        
+        # Register first user
+        response1 = SESSION.post(f"{BASE_URL}/users", data=dumps(user_data), headers=JSON_HEADERS)
+        if response1.ok:
+            emit("✅ First user registered successfully")
+        else:
+            emit(f"❌ First registration failed: {response1.status_code} - {response1.text}")
+            return False
+        
+        # Try to register with same email
+        user_data2 = user_data.copy()
+        user_data2["username"] = "differentuser"
+        
+        response2 = SESSION.post(f"{BASE_URL}/users", data=dumps(user_data2), headers=JSON_HEADERS)
+        if response2.status_code == 400 and b"Email already registered" in response2.content:
+            emit("✅ Duplicate email correctly rejected")
+        else:
+            emit(f"❌ Duplicate email not rejected properly: {response2.status_code} - {response2.text}")
+            return False
+        
+        # Try to register with same username
+        user_data3 = user_data.copy()
+        user_data3["email"] = f"different{timestamp}@example.com"
+        
+        response3 = SESSION.post(f"{BASE_URL}/users", data=dumps(user_data3), headers=JSON_HEADERS)
+        if response3.status_code == 400 and b"Username already taken" in response3.content:
+            emit("✅ Duplicate username correctly rejected")
+        else:
+            emit(f"❌ Duplicate username not rejected properly: {response3.status_code} - {response3.text}")
+            return False
+        
+        return True
 
 def test_validation_order():
     """Test that validation happens before database operations"""
-    print("🧪 Testing validation order (fast-fail)...")
-    
-    # Test invalid email format
-    invalid_email_data = {
-        "email": "invalid-email-format",
-        "username": "validuser",
-        "password": "securepassword",
-        "profile": {
-            "privacy_settings": {
-                "profile_visibility": "public",
-                "statistics_visibility": "public",
-                "history_visibility": "public"
-            }
-        }
-    }
-    
-    response = requests.post(f"{BASE_URL}/users", json=invalid_email_data)
-    if response.status_code == 400 and "Invalid email format" in response.text:
-        print("✅ Invalid email format correctly rejected (fast-fail)")
-    else:
-        print(f"❌ Invalid email format not rejected: {response.status_code} - {response.text}")
-        return False
-    
-    # Test invalid username length
-    invalid_username_data = {
-        "email": "valid@example.com",
-        "username": "ab",  # Too short
-        "password": "securepassword",
-        "profile": {
-            "privacy_settings": {
-                "profile_visibility": "public",
-                "statistics_visibility": "public",
-                "history_visibility": "public"
-            }
-        }
-    }
-    
-    response = requests.post(f"{BASE_URL}/users", json=invalid_username_data)
-    if response.status_code == 400 and "Username must be between 3 and 50 characters" in response.text:
-        print("✅ Invalid username length correctly rejected (fast-fail)")
-    else:
-        print(f"❌ Invalid username length not rejected: {response.status_code} - {response.text}")
-        return False
-    
-    return True
+    with buffered_output() as emit:
+        emit("🧪 Testing validation order (fast-fail)...")
+        
+        for label, email, username, expected_error in VALIDATION_CASES:
+            payload = {**VALIDATION_PAYLOAD, "email": email, "username": username}
+            response = SESSION.post(f"{BASE_URL}/users", data=dumps(payload), headers=JSON_HEADERS)
+            if response.status_code == 400 and expected_error in response.content:
+                emit(f"✅ {label} correctly rejected (fast-fail)")
+            else:
+                emit(f"❌ {label} not rejected: {response.status_code} - {response.text}")
+                return False
+        
+        return True
 
 def main():
     print("🚀 Testing Database Safety and Performance Optimizations")
@@ -3,165 +3,159 @@
 Test script for user management API endpoints
 """
 
-import requests
-import json
 import sys
-from datetime import datetime, timedelta
-import jwt
+import time
+
+from test_utils.fast_json import JSON_HEADERS, dumps, loads
+from test_utils.jwt_helper import make_token
+from test_utils.output import buffered_output
+from test_utils.parallel import run_concurrently
+from test_utils.lazy_session import LazySession
 
 # Configuration
 BASE_URL = "http://localhost:3000"
-JWT_SECRET = "your-super-secret-jwt-key-change-this-in-production-please"  # Should match backend/.env
 
-def create_test_jwt(user_id: str, email: str, username: str) -> str:
-    """Create a test JWT token for authentication"""
-    payload = {
-        "sub": user_id,
-        "email": email,
-        "username": username,
-        "exp": datetime.utcnow() + timedelta(hours=1),
-        "iat": datetime.utcnow()
+# Size the connection pool to the worker count so the thread pool is the limiter
+MAX_WORKERS = 4
+SESSION = LazySession(pool_connections=1, pool_maxsize=MAX_WORKERS)
+
+# Static request bodies, serialized once; registration splices in email/username
+_PROFILE_JSON = dumps({
+    "first_name": "Test",
+    "last_name": "User",
+    "display_name": "TestUser",
+    "bio": "I'm a test user for the Kilter Board app",
+    "preferred_units": "metric",
+    "privacy_settings": {
+        "profile_visibility": "public",
+        "statistics_visibility": "public",
+        "history_visibility": "public"
+    }
+})
+_UPDATE_JSON = dumps({
+    "profile": {
+        "first_name": "Updated",
+        "last_name": "User",
+        "display_name": "UpdatedTestUser",
+        "bio": "Updated bio for testing",
+        "location": "Test City",
+        "preferred_units": "imperial",
+        "privacy_settings": {
+            "profile_visibility": "public",
+            "statistics_visibility": "public",
+            "history_visibility": "friends"
+        }
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+})
 
 def test_user_registration():
     """Test user registration endpoint"""
-    print("🧪 Testing user registration...")
-    
-    # Use timestamp to make email unique
-    import time
-    timestamp = int(time.time())
-    
-    user_data = {
-        "email": f"testuser{timestamp}@example.com",
-        "username": f"testuser{timestamp}",
-        "password": "securepassword",
-        "profile": {
-            "first_name": "Test",
-            "last_name": "User",
-            "display_name": "TestUser",
-            "bio": "I'm a test user for the Kilter Board app",
-            "preferred_units": "metric",
-            "privacy_settings": {
-                "profile_visibility": "public",
-                "statistics_visibility": "public",
-                "history_visibility": "public"
+    with buffered_output() as emit:
+        emit("🧪 Testing user registration...")
+        
+        # Use timestamp to make email unique
+        timestamp = int(time.time())
+        
+        body = (
+            b'{"email":' + dumps(f"testuser{timestamp}@example.com")
+            + b',"username":' + dumps(f"testuser{timestamp}")
+            + b',"password":"securepassword","profile":' + _PROFILE_JSON + b"}"
+        )
+        
+        response = SESSION.post(f"{BASE_URL}/users", data=body, headers=JSON_HEADERS)
+        
+        if response.ok:
+            result = loads(response.content)
+            emit(f"✅ User registered successfully: {result['user']['username']}")
+            return {
+                'id': result['user']['id'],
+                'email': result['user']['email'],
+                'username': result['user']['username']
             }
-        }
-    }
-    
-    response = requests.post(f"{BASE_URL}/users", json=user_data)
-    
-    if response.status_code == 200:
-        result = response.json()
-        print(f"✅ User registered successfully: {result['user']['username']}")
-        return {
-            'id': result['user']['id'],
-            'email': result['user']['email'],
-            'username': result['user']['username']
-        }
-    else:
-        print(f"❌ Registration failed: {response.status_code} - {response.text}")
-        return None
+        else:
+            emit(f"❌ Registration failed: {response.status_code} - {response.text}")
+            return None
 
-def test_get_current_user(user_id: str, email: str, username: str):
+# The profile reads take emit so run_concurrently can collect their output in order
+def test_get_current_user(emit, headers: dict):
     """Test getting current user profile"""
-    print("🧪 Testing get current user...")
+    emit("🧪 Testing get current user...")
     
-    # Create JWT token for the test user
-    token = create_test_jwt(user_id, email, username)
-    headers = {"Authorization": f"Bearer {token}"}
+    response = SESSION.get(f"{BASE_URL}/users/me", headers=headers)
     
-    response = requests.get(f"{BASE_URL}/users/me", headers=headers)
-    
-    if response.status_code == 200:
-        result = response.json()
-        print(f"✅ Got user profile: {result['username']}")
-        print(f"   Profile: {result['profile']['display_name']}")
-        print(f"   Statistics: {result['statistics']}")
+    if response.ok:
+        result = loads(response.content)
+        emit(f"✅ Got user profile: {result['username']}")
+        emit(f"   Profile: {result['profile']['display_name']}")
+        emit(f"   Statistics: {result['statistics']}")
         return True
     else:
-        print(f"❌ Get user failed: {response.status_code} - {response.text}")
+        emit(f"❌ Get user failed: {response.status_code} - {response.text}")
         return False
 
-def test_update_user_profile(user_id: str, email: str, username: str):
+def test_update_user_profile(headers: dict):
     """Test updating user profile"""
-    print("🧪 Testing profile update...")
-    
-    token = create_test_jwt(user_id, email, username)
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    update_data = {
-        "profile": {
-            "first_name": "Updated",
-            "last_name": "User",
-            "display_name": "UpdatedTestUser",
-            "bio": "Updated bio for testing",
-            "location": "Test City",
-            "preferred_units": "imperial",
-            "privacy_settings": {
-                "profile_visibility": "public",
-                "statistics_visibility": "public",
-                "history_visibility": "friends"
-            }
-        }
-    }
-    
-    response = requests.put(f"{BASE_URL}/users/me", json=update_data, headers=headers)
-    
-    if response.status_code == 200:
-        print("✅ Profile updated successfully")
-        return True
-    else:
-        print(f"❌ Profile update failed: {response.status_code} - {response.text}")
-        return False
+    with buffered_output() as emit:
+        emit("🧪 Testing profile update...")
+        
+        response = SESSION.put(
+            f"{BASE_URL}/users/me", data=_UPDATE_JSON, headers={**JSON_HEADERS, **headers}
+        )
+        
+        if response.ok:
+            emit("✅ Profile updated successfully")
+            return True
+        else:
+            emit(f"❌ Profile update failed: {response.status_code} - {response.text}")
+            return False
 
-def test_get_user_by_id(user_id: str):
+def test_get_user_by_id(emit, user_id: str):
     """Test getting public user profile by ID"""
-    print("🧪 Testing get user by ID...")
+    emit("🧪 Testing get user by ID...")
     
-    response = requests.get(f"{BASE_URL}/users/{user_id}")
+    response = SESSION.get(f"{BASE_URL}/users/{user_id}")
     
-    if response.status_code == 200:
-        result = response.json()
-        print(f"✅ Got public profile: {result['username']}")
-        print(f"   Display name: {result['profile']['display_name']}")
+    if response.ok:
+        result = loads(response.content)
+        emit(f"✅ Got public profile: {result['username']}")
+        emit(f"   Display name: {result['profile']['display_name']}")
         return True
     else:
-        print(f"❌ Get user by ID failed: {response.status_code} - {response.text}")
+        emit(f"❌ Get user by ID failed: {response.status_code} - {response.text}")
         return False
 
-def test_delete_user(user_id: str, email: str, username: str):
+def test_delete_user(headers: dict):
     """Test user account deletion"""
-    print("🧪 Testing account deletion...")
-    
-    token = create_test_jwt(user_id, email, username)
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    response = requests.delete(f"{BASE_URL}/users/me", headers=headers)
-    
-    if response.status_code == 200:
-        print("✅ Account deleted successfully")
-        return True
-    else:
-        print(f"❌ Account deletion failed: {response.status_code} - {response.text}")
-        return False
+    with buffered_output() as emit:
+        emit("🧪 Testing account deletion...")
+        
+        response = SESSION.delete(f"{BASE_URL}/users/me", headers=headers)
+        
+        if response.ok:
+            emit("✅ Account deleted successfully")
+            return True
+        else:
+            emit(f"❌ Account deletion failed: {response.status_code} - {response.text}")
+            return False
 
 def test_health_check():
     """Test that the server is running"""
-    print("🧪 Testing server health...")
-    
-    try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
-        if response.status_code == 200:
-            print("✅ Server is healthy")
-            return True
-        else:
-            print(f"❌ Health check failed: {response.status_code}")
+    import requests
+    
+    with buffered_output() as emit:
+        emit("🧪 Testing server health...")
+        
+        try:
+            response = SESSION.get(f"{BASE_URL}/health")
+            if response.ok:
+                emit("✅ Server is healthy")
+                return True
+            else:
+                emit(f"❌ Health check failed: {response.status_code}")
+                return False
+        except requests.exceptions.RequestException as e:
+            emit(f"❌ Cannot connect to server: {e}")
             return False
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Cannot connect to server: {e}")
-        return False
 
 def main():
     """Run all user API tests"""
@@ -186,28 +180,41 @@ def main():
     email = user_data['email']
     username = user_data['username']
     
-    print()
-    
-    # Test getting current user
-    if not test_get_current_user(user_id, email, username):
-        print("\n❌ Get current user test failed")
+    # Sign the token once and share it across the authenticated tests
+    token, _ = make_token(email, username, user_id=user_id, ttl=3600)
+    headers = {"Authorization": f"Bearer {token}"}
     
     print()
     
+    # The two profile reads don't depend on each other, so overlap their round
+    # trips; output and failures (including errors raised by a check) are
+    # reported in submission order
+    reads = run_concurrently([
+        (test_get_current_user, headers),
+        (test_get_user_by_id, user_id),
+    ], max_workers=MAX_WORKERS)
+    for name, (passed, lines) in zip(["Get current user", "Get user by ID"], reads):
+        print("\n".join(lines))
+        if not passed:
+            print(f"\n❌ {name} test failed")
+        print()
+    
     # Test profile update
-    if not test_update_user_profile(user_id, email, username):
+    if not test_update_user_profile(headers):
         print("\n❌ Profile update test failed")
     
     print()
     
-    # Test getting user by ID (public profile)
-    if not test_get_user_by_id(user_id):
-        print("\n❌ Get user by ID test failed")
+    # Re-read the public profile to confirm the update took effect
+    with buffered_output() as emit:
+        updated = test_get_user_by_id(emit, user_id)
+    if not updated:
+        print("\n❌ Get updated user by ID test failed")
     
     print()
     
     # Test account deletion (do this last)
-    if not test_delete_user(user_id, email, username):
+    if not test_delete_user(headers):
         print("\n❌ Account deletion test failed")
     
     print()
@@ -0,0 +1,34 @@
+"""
+JSON encoding for the test scripts
+Uses orjson when it is installed and falls back to the stdlib json module
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup, not a hard dependency
+    orjson = None
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def dumps(obj) -> bytes:
+    """Serialize obj to compact JSON bytes, ready to send as a request body"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def dumps_pretty(obj) -> str:
+    """Serialize obj to indented JSON for display"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def loads(data: bytes):
+    """Parse a JSON response body"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
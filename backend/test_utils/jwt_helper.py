@@ -0,0 +1,43 @@
+"""
+Shared JWT helper for the test scripts
+Signs HS256 tokens compatible with the backend's auth middleware
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from typing import Optional
+
+# JWT configuration (matches backend .env)
+JWT_SECRET = "your-super-secret-jwt-key-change-this-in-production-please"
+
+# Signing context, prepared once at import
+_HMAC_KEY = JWT_SECRET.encode("utf-8")
+_HEADER_B64 = b"eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"  # {"alg":"HS256","typ":"JWT"}
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def make_token(email: str, username: str, user_id: Optional[str] = None, ttl: int = 86400) -> tuple[str, str]:
+    """Create a signed test token, returning (token, user_id)"""
+    if user_id is None:
+        # Simple (unhyphenated) form; Uuid::parse_str on the backend accepts it
+        user_id = uuid.uuid4().hex
+
+    now = int(time.time())
+    payload = {
+        "sub": user_id,
+        "email": email,
+        "username": username,
+        "exp": now + ttl,
+        "iat": now
+    }
+
+    signing_input = _HEADER_B64 + b"." + _b64url(json.dumps(payload, separators=(",", ":")).encode())
+    signature = _b64url(hmac.new(_HMAC_KEY, signing_input, hashlib.sha256).digest())
+    return (signing_input + b"." + signature).decode("ascii"), user_id
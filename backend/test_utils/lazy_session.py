@@ -0,0 +1,27 @@
+"""
+Lazily-built HTTP session for the test scripts
+Keeps requests (and urllib3) out of import time, so collecting the scripts
+doesn't pay for the HTTP stack unless a test actually sends a request
+"""
+
+import threading
+
+
+class LazySession:
+    """Proxy that creates the real session on first attribute access"""
+
+    def __init__(self, **options):
+        self._options = options
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    from test_utils.session import make_session
+                    self._session = make_session(**self._options)
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
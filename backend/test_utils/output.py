@@ -0,0 +1,22 @@
+"""
+Buffered console output for the test scripts
+"""
+
+import sys
+from contextlib import contextmanager
+
+
+@contextmanager
+def buffered_output():
+    """Collect lines and write them to stdout in a single call on exit"""
+    lines = []
+
+    def emit(line: str = "") -> None:
+        lines.append(line)
+
+    try:
+        yield emit
+    finally:
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
@@ -0,0 +1,36 @@
+"""
+Concurrent endpoint checks for the test scripts
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 5
+
+
+def _collect(check, args) -> tuple:
+    lines = []
+    try:
+        result = check(lines.append, *args)
+    except Exception as e:
+        # Report the failure in place so one bad endpoint doesn't discard the
+        # output of every other check
+        lines.append(f"   ❌ {type(e).__name__}: {e}")
+        result = None
+    return result, lines
+
+
+def run_concurrently(checks, max_workers: int = DEFAULT_WORKERS) -> list[tuple]:
+    """Run checks concurrently, returning (result, output lines) for each in submission order
+
+    Each entry is a (check, *args) tuple and is called as check(emit, *args), so
+    request round trips overlap while the report still reads top to bottom. A
+    check that raises gets a result of None and its error appended to its lines.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_collect, check, args) for check, *args in checks]
+        return [future.result() for future in futures]
+
+
+def run_checks(checks, max_workers: int = DEFAULT_WORKERS) -> list[list[str]]:
+    """Like run_concurrently, for checks that only report output"""
+    return [lines for _, lines in run_concurrently(checks, max_workers)]
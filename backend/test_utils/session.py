@@ -0,0 +1,71 @@
+"""
+Shared HTTP session for the backend test scripts
+"""
+
+import atexit
+import socket
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+USER_AGENT = "kilter-test"
+DEFAULT_TIMEOUT = 5  # seconds
+
+# Retry transient failures instead of failing the test: refused connections,
+# 502/503/504 responses, and idempotent requests that hit a read error, such as
+# a pooled keep-alive connection the server dropped mid-request. POST is left
+# out of allowed_methods so POST /users, which may already have created the
+# user, is never sent twice. raise_on_status=False hands back the last response
+# so the scripts still report the real status code
+DEFAULT_RETRY = Retry(
+    total=2,
+    backoff_factor=0.05,
+    status_forcelist=[502, 503, 504],
+    allowed_methods=frozenset(["GET", "PUT", "DELETE"]),
+    raise_on_status=False,
+)
+
+# urllib3's defaults already disable Nagle (TCP_NODELAY); also enable TCP
+# keepalive so idle pooled connections to the backend stay usable
+SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+
+class SessionHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with tuned sockets and a default timeout for requests that don't set one"""
+
+    def __init__(self, *args, timeout: float = DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def make_session(
+    pool_connections: int = 4, pool_maxsize: int = 20, timeout: float = DEFAULT_TIMEOUT
+) -> requests.Session:
+    """Create a keep-alive session that is closed when the interpreter exits"""
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+
+    adapter = SessionHTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=DEFAULT_RETRY,
+        timeout=timeout,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    atexit.register(session.close)
+    return session
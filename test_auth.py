@@ -2,98 +2,56 @@
 """
 Test script to generate JWT tokens and test authentication endpoints
 """
-import jwt
-import uuid
-import time
-from datetime import datetime, timedelta
-import requests
-import json
+import sys
+from pathlib import Path
+from typing import Optional
 
-# JWT configuration (should match backend)
-JWT_SECRET = "your-super-secret-jwt-key-change-this-in-production-please"
-JWT_ALGORITHM = "HS256"
-EXPIRATION_HOURS = 24
+sys.path.insert(0, str(Path(__file__).resolve().parent / "backend"))
+from test_utils.fast_json import loads
+from test_utils.jwt_helper import make_token
+from test_utils.output import buffered_output
+from test_utils.parallel import run_checks
+from test_utils.lazy_session import LazySession
 
-def create_test_token(user_id=None, email="test@example.com", username="testuser"):
-    """Create a test JWT token"""
-    if user_id is None:
-        user_id = str(uuid.uuid4())
-    
-    now = datetime.utcnow()
-    exp = now + timedelta(hours=EXPIRATION_HOURS)
-    
-    payload = {
-        "sub": user_id,
-        "email": email,
-        "username": username,
-        "exp": int(exp.timestamp()),
-        "iat": int(now.timestamp())
-    }
-    
-    token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
-    return token, user_id
+BASE_URL = "http://localhost:3000"
 
-def test_endpoints():
-    """Test the authentication endpoints"""
-    base_url = "http://localhost:3000"
-    
-    # Create a test token
-    token, user_id = create_test_token()
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    print(f"Generated test token for user: {user_id}")
-    print(f"Token: {token[:50]}...")
-    print()
-    
-    # Test public endpoint
-    print("Testing public endpoint (/health):")
-    try:
-        response = requests.get(f"{base_url}/health")
-        print(f"Status: {response.status_code}")
-        print(f"Response: {response.json()}")
-    except Exception as e:
-        print(f"Error: {e}")
-    print()
-    
-    # Test protected endpoint without token
-    print("Testing protected endpoint without token (/protected):")
-    try:
-        response = requests.get(f"{base_url}/protected")
-        print(f"Status: {response.status_code}")
-        print(f"Response: {response.json()}")
-    except Exception as e:
-        print(f"Error: {e}")
-    print()
-    
-    # Test protected endpoint with token
-    print("Testing protected endpoint with token (/protected):")
-    try:
-        response = requests.get(f"{base_url}/protected", headers=headers)
-        print(f"Status: {response.status_code}")
-        print(f"Response: {response.json()}")
-    except Exception as e:
-        print(f"Error: {e}")
-    print()
-    
-    # Test user info endpoint with token
-    print("Testing user info endpoint with token (/user-info):")
-    try:
-        response = requests.get(f"{base_url}/user-info", headers=headers)
-        print(f"Status: {response.status_code}")
-        print(f"Response: {response.json()}")
-    except Exception as e:
-        print(f"Error: {e}")
-    print()
-    
-    # Test with invalid token
-    print("Testing with invalid token:")
-    invalid_headers = {"Authorization": "Bearer invalid-token"}
+SESSION = LazySession()
+INVALID_HEADERS = {"Authorization": "Bearer invalid-token"}
+
+def check_endpoint(emit, title: str, path: str, headers: Optional[dict] = None):
+    """Request one endpoint and report its status and body"""
+    emit(title)
     try:
-        response = requests.get(f"{base_url}/protected", headers=invalid_headers)
-        print(f"Status: {response.status_code}")
-        print(f"Response: {response.json()}")
+        response = SESSION.get(f"{BASE_URL}{path}", headers=headers)
+        emit(f"Status: {response.status_code}")
+        emit(f"Response: {loads(response.content) if response.ok else response.text}")
     except Exception as e:
-        print(f"Error: {e}")
+        emit(f"Error: {e}")
+
+def test_endpoints():
+    """Test the authentication endpoints"""
+    with buffered_output() as emit:
+        # Create a test token
+        token, user_id = make_token("test@example.com", "testuser")
+        auth_headers = {"Authorization": "Bearer " + token}
+        
+        emit(f"Generated test token for user: {user_id}")
+        emit(f"Token: {token[:50]}...")
+        emit()
+        
+        # The checks are independent, so overlap their round trips
+        results = run_checks([
+            (check_endpoint, "Testing public endpoint (/health):", "/health"),
+            (check_endpoint, "Testing protected endpoint without token (/protected):", "/protected"),
+            (check_endpoint, "Testing protected endpoint with token (/protected):", "/protected", auth_headers),
+            (check_endpoint, "Testing user info endpoint with token (/user-info):", "/user-info", auth_headers),
+            (check_endpoint, "Testing with invalid token:", "/protected", INVALID_HEADERS),
+        ])
+        for i, lines in enumerate(results):
+            if i:
+                emit()
+            for line in lines:
+                emit(line)
 
 if __name__ == "__main__":
     test_endpoints()
\ No newline at end of file